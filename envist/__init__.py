@@ -62,6 +62,12 @@ Usage:
     # list_elements <list> = 1, 2, 3, 4, 5
     env.get('list_elements', cast=list)
 
+    # cast=list, tuple or set splits a string value on commas, the same as
+    # the <list>, <tuple> and <set> annotations
+    # colors = red,green,blue
+    env.get('colors', cast=list) # Output: ['red', 'green', 'blue']
+    env.get('colors', cast=tuple) # Output: ('red', 'green', 'blue')
+
     # Working with variables
     # server <str> = 127.0.0.1
     # port <int> = 8080
@@ -71,14 +77,19 @@ Usage:
 '''
 
 from typing import Any, Callable, Optional, Union
+import csv
 import os
 import re
+import sys
 
 
 __version__ = '0.0.3'
 __all__ = ['Envist']
 __author__ = 'Md. Almas Ali'
 
+# ${variable}
+_VARIABLE_RE = re.compile(r'\$\{(.+?)\}')
+
 
 class EnvistCastError(Exception):
     '''
@@ -104,6 +115,32 @@ class EnvistTypeError(Exception):
     '''
 
 
+def _parse_line(line: str) -> tuple[str, Optional[str], str]:
+    '''
+    Split a single env line into its key, cast type and raw value.
+    '''
+    # key <cast> = value, split on the first '=' and then the first '<'
+    key, _, value = line.partition('=')
+    cast = None
+    if '<' in key:
+        key, _, cast = key.partition('<')
+        cast = cast.strip()
+        if cast.endswith('>'):
+            cast = cast[:-1].rstrip()
+    key, value = key.rstrip(), value.lstrip()
+
+    if not key or not value or cast == '':
+        raise EnvistParseError(f'Unable to parse "{line}"')
+    return key, cast, value
+
+
+def _to_bool(value: str) -> bool:
+    '''
+    Cast a string to bool, only "true" (in any case) is truthy.
+    '''
+    return value.lower() == 'true'
+
+
 class Envist:
     '''
     Envist is a simple .env file parser for Python. It's a single file module with no dependencies.
@@ -119,87 +156,65 @@ class Envist:
         Load env variables from file.
         '''
         with open(self.path, 'r', encoding='utf-8') as file:
-            # Remove empty lines, newlines, and comments
-            _lines = [line.strip() for line in file.readlines()
-                      if line.strip() and not line.startswith('#')]
+            # Remove empty lines, newlines, and comments (strip each line
+            # once, then a single character test drops comments). Text
+            # mode has already turned \r\n and \r into \n; splitlines()
+            # is avoided as it also breaks values on \x0c, \u2028, etc.
+            _lines = [line
+                      for line in map(str.strip, file.read().split('\n'))
+                      if line and line[0] != '#']
+
+            # OS environment variable is always string
+            environ: dict[str, str] = {}
 
             try:
                 for line in _lines:
-                    try:
-                        key, cast, value = re.search(
-                            r'(.+?)\s*<\s*(.+?)\s*>?\s*=\s*(.+)', line
-                        ).groups()
-                    except AttributeError:
-                        key, value = re.search(
-                            (r'(.+?)\s*=\s*(.+)'), line).groups()
-                        cast = None
-
-                    if self.__is_variable(value):
+                    key, cast, value = _parse_line(line)
+                    # Interned keys make later get() lookups with literal
+                    # key names an identity hit
+                    key = sys.intern(key)
+
+                    # Only values with a ${var} reference need expanding
+                    if '${' in value:
                         value = self.__resolve_variable(value)
 
                     if cast:
                         value = self.__resolve_type_cast(value, cast)
 
                     self.env[key] = value
-                    # OS environment variable is always string
-                    os.environ[key] = str(value)
+                    environ[key] = str(value)
 
             except ValueError as exception:
                 raise EnvistParseError(
                     f'Unable to parse "{line}"') from exception
+
+            os.environ.update(environ)
         return self.env
 
     def __resolve_variable(self, value: str) -> str:
-        # Checking variable match ${var}
-        pattern = re.compile(r'\$\{(.+?)\}')
-        match = pattern.findall(value)
-        if match:
-            for match_element in match:
-                if match_element in self.env:
-                    value = value.replace(
-                        f'${{{match_element}}}', str(self.env[match_element]))
-        return value
-
-    def __resolve_type_cast(self, value: str, cast: str) -> Any:
         '''
-        Validate cast type.
+        Expand ${var} references to already loaded variables.
         '''
-        if cast == 'int':
-            value = int(value)
-        elif cast == 'float':
-            value = float(value)
-        elif cast == 'bool':
-            if value.lower() == 'true':
-                value = True
-            else:
-                value = False
-        elif cast in ('list', 'List'):
-            value = List(value)
-        elif cast == 'str':
-            value = str(value)
-        elif cast in ('dict', 'Dict'):
-            value = Dict(value)
-        elif cast in ('tuple', 'Tuple'):
-            value = Tuple(value)
-        elif cast in ('set', 'Set'):
-            value = Set(value)
-        elif cast in ('csv', 'CSV'):
-            value = CSV(value)
-        elif cast in ('json', 'JSON'):
-            value = JSON(value)
-        else:
-            raise EnvistCastError(f'"{cast}" is not a valid cast type')
+        env = self.env
 
-        return value
+        def replace(match: re.Match) -> str:
+            # Unknown variables are left as they are
+            name = match.group(1)
+            return str(env[name]) if name in env else match.group(0)
 
-    def __is_variable(self, value: str) -> bool:
+        return _VARIABLE_RE.sub(replace, value)
+
+    def __resolve_type_cast(self, value: str, cast: str) -> Any:
         '''
-        Check if value is a variable.
+        Validate cast type.
         '''
-        pattern = re.compile(r'\$\{(.+?)\}')
-        match = pattern.findall(value)
-        if match:
-            return True
+        try:
+            caster = _CASTS[cast]
+        except KeyError:
+            raise EnvistCastError(
+                f'"{cast}" is not a valid cast type') from None
+
+        return caster(value)
 
     def get(self, key: str, *, default: Any = None,
             cast: Optional[Union[Callable[[str], Any], str]] = None) -> Any:
@@ -210,27 +225,23 @@ class Envist:
 
         try:
             if cast:
-                if isinstance(cast, list):
-                    value = List(value)
-                elif isinstance(cast, dict):
-                    value = Dict(value)
-                elif isinstance(cast, tuple):
-                    value = Tuple(value)
-                elif isinstance(cast, set):
-                    value = Set(value)
-                elif isinstance(cast, str):
+                if isinstance(cast, str):
                     value = str(value)
-                elif isinstance(cast, int):
-                    value = int(value)
-                elif isinstance(cast, float):
-                    value = float(value)
-                elif isinstance(cast, bool):
-                    value = bool(value)
-                elif isinstance(cast, CSV):
-                    value = CSV(value)
-                elif isinstance(cast, JSON):
-                    value = JSON(value)
+                elif not callable(cast):
+                    # Backward compatible instance casts, e.g. cast=[1]
+                    # casts like list and cast=5 like int
+                    for kind, caster in _INSTANCE_CASTS:
+                        if isinstance(cast, kind):
+                            value = caster(value)
+                            break
+                    else:
+                        raise EnvistCastError(
+                            f'"{cast}" is not a valid cast type')
                 else:
+                    if isinstance(cast, type) and isinstance(value, str):
+                        # Builtin containers split on commas, like their
+                        # env file casts, i.e. cast=list behaves as <list>
+                        cast = _TYPE_CASTS.get(cast, cast)
                     value = cast(value)
 
         except ValueError as exception:
@@ -292,13 +303,12 @@ class Envist:
         if sort_keys:
             self.env = dict(sorted(self.env.items()))
 
+        separator = ' = ' if pretty else '='
+        content = ''.join([f'{key}{separator}{value}\n'
+                           for key, value in self.env.items()])
+
         with open(self.path, 'w', encoding='utf-8') as file:
-            if pretty:
-                for key, value in self.env.items():
-                    file.write(f'{key} = {value}\n')
-            else:
-                for key, value in self.env.items():
-                    file.write(f'{key}={value}\n')
+            file.write(content)
 
     def __repr__(self) -> str:
         '''
@@ -357,9 +367,6 @@ class Tuple(tuple):
     def __new__(cls, value: str) -> tuple:
         return super().__new__(cls, value.split(','))
 
-    def __init__(self, value: str) -> None:
-        super().__init__(value.split(','))
-
     # def __repr__(self) -> str:
     #     return f'<envist.Tuple {super().__repr__()}>'
 
@@ -385,16 +392,22 @@ class Set(set):
         return f'{super().__str__()}'
 
 
-class CSV:
+class CSV(list):
     '''
-    A class to cast env variable to csv.
+    A list subclass to cast env variable to csv.
     '''
 
-    def __new__(cls, value: str) -> str:
-        return super().__new__(cls, value.split(','))
-
     def __init__(self, value: str) -> None:
-        super().__init__(value.split(','))
+        # csv handles quoted fields, e.g. a, "b,c", d. Spaces after a
+        # comma are skipped, and strict mode rejects an unterminated quote
+        # (a,"b) or text after a closing quote (a,"b"x). A quote inside an
+        # unquoted field (a,b"c) is kept as a literal character.
+        reader = csv.reader([value], strict=True, skipinitialspace=True)
+        try:
+            super().__init__(next(reader, []))
+        except csv.Error as exception:
+            raise ValueError(
+                f'Invalid CSV "{value}": {exception}') from exception
 
     # def __repr__(self) -> str:
     #     return f'<envist.CSV {super().__repr__()}>'
@@ -419,3 +432,41 @@ class JSON:
 
     def __str__(self) -> str:
         return f'{super().__str__()}'
+
+
+# Cast types accepted in env file annotations, i.e. key <cast> = value
+_CASTS: dict[str, Callable[[str], Any]] = {
+    'int': int,
+    'float': float,
+    'bool': _to_bool,
+    'str': str,
+    'list': List,
+    'List': List,
+    'dict': Dict,
+    'Dict': Dict,
+    'tuple': Tuple,
+    'Tuple': Tuple,
+    'set': Set,
+    'Set': Set,
+    'csv': CSV,
+    'CSV': CSV,
+    'json': JSON,
+    'JSON': JSON,
+}
+
+# Builtin types passed as Envist.get(cast=...) mapped to their env casts
+_TYPE_CASTS: dict[type, Callable[[str], Any]] = {
+    list: List,
+    tuple: Tuple,
+    set: Set,
+}
+
+# Non-callable instances passed as Envist.get(cast=...), checked in order
+_INSTANCE_CASTS: tuple[tuple[type, Callable[[str], Any]], ...] = (
+    (list, List),
+    (dict, Dict),
+    (tuple, Tuple),
+    (set, Set),
+    (int, int),
+    (float, float),
+)